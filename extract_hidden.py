@@ -20,6 +20,7 @@ class ExtractionState:
     dumped = False
     payload_addr = 0
     payload_size = 0
+    output_filename = OUTPUT_FILENAME
 
 state = ExtractionState()
 
@@ -59,14 +60,14 @@ class WriteInterceptor(gdb.Breakpoint):
                 state.dumped = True
                 
                 # --- ACTION DE DUMP ---
-                logging.info(f"Extraction en cours vers '{OUTPUT_FILENAME}'...")
+                logging.info(f"Extraction en cours vers '{state.output_filename}'...")
                 
                 # Utilisation de la commande dump de GDB
                 # Syntaxe : dump memory <fichier> <debut> <fin>
-                cmd = f"dump memory {OUTPUT_FILENAME} {buf_addr} {buf_addr + count}"
+                cmd = f"dump memory {state.output_filename} {buf_addr} {buf_addr + count}"
                 gdb.execute(cmd)
                 
-                logging.info(f"Extraction réussie ! Fichier généré : {os.path.abspath(OUTPUT_FILENAME)}")
+                logging.info(f"Extraction réussie ! Fichier généré : {os.path.abspath(state.output_filename)}")
                 return True # Arrêt de l'exécution (On a fini)
                 
         except Exception as e:
@@ -76,7 +77,22 @@ class WriteInterceptor(gdb.Breakpoint):
 
 # ================= MAIN EXECUTION =================
 
-def run_extractor():
+def run_extractor(output_filename=OUTPUT_FILENAME, quit_gdb=True):
+    """
+    Lance l'extraction du payload.
+
+    Args:
+        output_filename (str): Fichier de sortie du payload.
+        quit_gdb (bool): Quitte GDB à la fin. Mettre à False lorsque le script
+            est piloté par un worker résident (gdb_pool.py).
+
+    Returns:
+        bool: True si un ELF a été extrait.
+    """
+    global state
+    state = ExtractionState()
+    state.output_filename = output_filename
+
     logging.info("--- Démarrage de l'extracteur automatique ---")
     
     # Détection automatique du binaire chargé
@@ -88,7 +104,7 @@ def run_extractor():
     except:
         logging.error("Erreur : Aucun binaire chargé dans GDB.")
         logging.info("Usage: gdb -x extract_hidden.py <votre_loader>")
-        return
+        return False
 
     # Configuration GDB pour la performance et le silence
     gdb.execute("set pagination off")
@@ -105,7 +121,7 @@ def run_extractor():
             WriteInterceptor("__write")
         except:
             logging.error("Échec de l'installation des hooks. Le binaire est-il strippé statique ?")
-            return
+            return False
 
     logging.info("Lancement du processus...")
     
@@ -119,10 +135,12 @@ def run_extractor():
 
     if state.dumped:
         logging.info("--- Opération terminée avec SUCCÈS ---")
-        gdb.execute("quit")
     else:
         logging.error("Le programme s'est terminé sans qu'aucun ELF ne soit détecté dans un appel write().")
+
+    if quit_gdb:
         gdb.execute("quit")
+    return state.dumped
 
 if __name__ == "__main__":
     run_extractor()
\ No newline at end of file
@@ -0,0 +1,577 @@
+import os
+import re
+import sys
+import json
+import time
+import signal
+import logging
+import argparse
+import threading
+import subprocess
+from concurrent.futures import Future, wait
+
+# ================= CONFIGURATION DU LOGGING =================
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s',
+    datefmt='%H:%M:%S',
+    stream=sys.stdout
+)
+
+# ================= CONFIGURATION DU POOL =================
+GDB_BINARY     = "gdb"
+GDB_ARGS       = ["--interpreter=mi", "-q", "-nx"]  # Machine Interface, sans .gdbinit
+SCRIPTS_DIR    = os.path.dirname(os.path.abspath(__file__))
+RESULT_MARKER  = "@@POOL "   # Préfixe des résultats renvoyés par le côté GDB
+
+# Valeurs par défaut reprises de extract_DAT.py (tableau chiffré de hidden.bin)
+DEFAULT_DUMP_ADDR = 0x4a60e0
+DEFAULT_DUMP_SIZE = 209
+
+# Modules pré-importés au démarrage du worker (coût payé une seule fois, tqdm inclus)
+PRELOADED_MODULES = ["gdb_pool", "extract_hidden", "solve_dynamic"]
+
+JOB_TYPES = ("extract-payload", "dump-range", "dynamic-solve", "capture-trace")
+
+
+class MIError(RuntimeError):
+    """Erreur renvoyée par GDB (^error) ou perte du processus worker."""
+
+
+# ================= UTILITAIRES MI =================
+
+def mi_quote(text: str) -> str:
+    """Encode une chaîne en C-string MI (guillemets et antislashs échappés)."""
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+
+_MI_ESCAPES = {'n': b'\n', 't': b'\t', 'r': b'\r', '"': b'"', '\\': b'\\'}
+
+def mi_unquote(text: str) -> str:
+    """
+    Décode une C-string MI (ex: ~"Hello\\n").
+    GDB encode les octets non-ASCII en octal (\\303\\251), on reconstruit donc
+    des octets avant de décoder en UTF-8.
+    """
+    if text.startswith('"') and text.endswith('"'):
+        text = text[1:-1]
+    out = bytearray()
+    i = 0
+    while i < len(text):
+        c = text[i]
+        if c == '\\' and i + 1 < len(text):
+            nxt = text[i + 1]
+            if nxt in _MI_ESCAPES:
+                out += _MI_ESCAPES[nxt]
+                i += 2
+                continue
+            octal = re.match(r'[0-7]{1,3}', text[i + 1:i + 4])
+            if octal:
+                out.append(int(octal.group(0), 8) & 0xFF)
+                i += 1 + len(octal.group(0))
+                continue
+        out += c.encode('utf-8')
+        i += 1
+    return out.decode('utf-8', errors='replace')
+
+
+# ================= MESURE MÉMOIRE =================
+
+def reset_peak_rss(pid="self"):
+    """Remet à zéro le pic de RSS (VmHWM) d'un processus (Linux, /proc/<pid>/clear_refs)."""
+    try:
+        with open(f"/proc/{pid}/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def read_peak_rss_kb(pid="self"):
+    """Renvoie le pic de RSS (VmHWM) en Ko, ou None si indisponible."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+# ================= JOBS =================
+
+class Job:
+    """
+    Tâche soumise au pool.
+
+    Args:
+        kind (str): Type de tâche ('extract-payload', 'dump-range', 'dynamic-solve', 'capture-trace').
+        binary (str): Binaire à charger dans GDB (réutilisé s'il est déjà chargé).
+        params (dict): Paramètres spécifiques à la tâche.
+    """
+    def __init__(self, kind, binary, **params):
+        if kind not in JOB_TYPES:
+            raise ValueError(f"Type de tâche inconnu : {kind}")
+        self.kind = kind
+        self.binary = os.path.abspath(binary)
+        self.params = params
+        self.future = Future()
+
+    def __repr__(self):
+        return f"Job({self.kind}, {os.path.basename(self.binary)})"
+
+
+# ================= WORKER GDB/MI =================
+
+class MIWorker:
+    """
+    Processus GDB résident piloté via la Machine Interface.
+    Responsabilité : Exécuter des tâches en réutilisant le progspace déjà chargé.
+    """
+    def __init__(self, name, cwd=None):
+        self.name = name
+        self.cwd = cwd or os.getcwd()
+        self.proc = None
+        self.loaded_binary = None
+        self.loaded_stamp = None
+        self._token = 0
+
+    # --- Cycle de vie ---
+
+    def start(self):
+        """Démarre GDB et pré-importe les scripts (une seule fois par worker)."""
+        t0 = time.perf_counter()
+        self.proc = subprocess.Popen(
+            [GDB_BINARY] + GDB_ARGS,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            cwd=self.cwd, text=True, encoding='utf-8', errors='replace', bufsize=1
+        )
+        self._read_until_prompt()
+        self.loaded_binary = None
+        self.loaded_stamp = None
+
+        self.command("-gdb-set pagination off")
+        self.command("-gdb-set confirm off")
+        # Le programme débogué ne doit pas écrire dans le flux MI ("Enter flag: "...)
+        self.command("-inferior-tty-set /dev/null")
+        self.console(f"python import sys; sys.path.insert(0, {SCRIPTS_DIR!r})")
+        self.console(f"python import {', '.join(PRELOADED_MODULES)}")
+        logging.info(f"[{self.name}] GDB prêt (pid {self.proc.pid}) en {time.perf_counter() - t0:.2f}s")
+
+    def stop(self):
+        """Arrête proprement le processus GDB."""
+        if self.proc and self.proc.poll() is None:
+            try:
+                self.proc.stdin.write("-gdb-exit\n")
+                self.proc.stdin.flush()
+                self.proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.proc.kill()
+        self.proc = None
+        self.loaded_binary = None
+        self.loaded_stamp = None
+
+    def alive(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def inferior_pids(self):
+        """PIDs des processus fils de GDB (programmes débogués), via /proc."""
+        pids = []
+        try:
+            for tid in os.listdir(f"/proc/{self.proc.pid}/task"):
+                with open(f"/proc/{self.proc.pid}/task/{tid}/children") as f:
+                    pids += [int(pid) for pid in f.read().split()]
+        except OSError:
+            pass
+        return pids
+
+    def kill(self):
+        """
+        Tue le programme débogué puis GDB. L'inferior est tué en premier :
+        sinon, GDB disparu, il serait détaché et continuerait son exécution.
+        GDB étant occupé dans le job Python, une commande MI 'kill' ne serait
+        pas traitée ; on passe donc par son PID.
+        """
+        if not self.alive():
+            return
+        for pid in self.inferior_pids():
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+        self.proc.kill()
+
+    # --- Protocole MI ---
+
+    def _readline(self):
+        line = self.proc.stdout.readline()
+        if not line:
+            raise MIError(f"[{self.name}] Le processus GDB s'est terminé de manière inattendue.")
+        return line.rstrip('\n')
+
+    def _read_until_prompt(self):
+        while self._readline().strip() != "(gdb)":
+            pass
+
+    def command(self, cmd, until_marker=False):
+        """
+        Envoie une commande MI et attend sa fin.
+
+        Args:
+            cmd (str): Commande MI (sans token).
+            until_marker (bool): Attend la ligne RESULT_MARKER au lieu du
+                résultat MI. Nécessaire lorsque la commande relance l'inferior :
+                GDB émet alors '^running' puis plus aucun '^done'.
+
+        Returns:
+            tuple: (enregistrement résultat brut, texte console décodé)
+        """
+        token = self._send(cmd)
+        console = ""
+        result = None
+        while True:
+            line = self._readline()
+            if line.startswith('~'):
+                console += mi_unquote(line[1:])
+                if until_marker and re.search(re.escape(RESULT_MARKER) + r'.*\n', console):
+                    self._sync()
+                    return result, console
+            elif line.startswith(token + '^'):
+                result = line[len(token) + 1:]
+                if result.startswith("error"):
+                    self._read_until_prompt()
+                    msg = re.search(r'msg="((?:[^"\\]|\\.)*)"', result)
+                    raise MIError(mi_unquote(msg.group(1)) if msg else result)
+            elif line.strip() == "(gdb)" and result is not None and not until_marker:
+                return result, console
+
+    def _send(self, cmd):
+        self._token += 1
+        token = str(self._token)
+        self.proc.stdin.write(f"{token}{cmd}\n")
+        self.proc.stdin.flush()
+        return token
+
+    def _sync(self):
+        """Resynchronise le flux MI : ignore tout jusqu'à la réponse d'une commande neutre."""
+        token = self._send("-gdb-show confirm")
+        while not self._readline().startswith(token + '^'):
+            pass
+        self._read_until_prompt()
+
+    def console(self, cli_cmd, until_marker=False):
+        """Exécute une commande CLI (ou Python) via l'interpréteur console."""
+        return self.command(f"-interpreter-exec console {mi_quote(cli_cmd)}", until_marker=until_marker)
+
+    # --- Exécution des tâches ---
+
+    def ensure_loaded(self, binary):
+        """
+        Charge le binaire uniquement s'il diffère du progspace courant.
+        Le fichier est aussi rechargé s'il a été réécrit depuis (ex: hidden.bin
+        régénéré par 'extract-payload') : '-data-read-memory-bytes' ne lance
+        pas le programme, GDB ne relirait donc jamais le nouveau contenu.
+        """
+        st = os.stat(binary)
+        stamp = (st.st_mtime_ns, st.st_size)
+        if self.loaded_binary == binary and self.loaded_stamp == stamp:
+            return
+        self.command(f"-file-exec-and-symbols {mi_quote(binary)}")
+        self.loaded_binary = binary
+        self.loaded_stamp = stamp
+        logging.info(f"[{self.name}] Binaire chargé : {binary}")
+
+    def run(self, job):
+        """Exécute une tâche et renvoie son résultat (dict)."""
+        self.ensure_loaded(job.binary)
+        try:
+            if job.kind == "dump-range":
+                return self._dump_range(job)
+            return self._python_job(job)
+        finally:
+            # Nettoyage : le progspace reste chargé, mais plus d'inferior, de
+            # breakpoint ni d'arguments (ex: 'set args < input.<pid>.txt')
+            if job.kind != "dump-range":
+                for cmd in ("kill", "delete", "set args"):
+                    try:
+                        self.console(cmd)
+                    except MIError:
+                        pass
+
+    def _dump_range(self, job):
+        """Lecture mémoire directe via MI (aucun lancement du programme)."""
+        addr = int(job.params.get("addr", DEFAULT_DUMP_ADDR))
+        size = int(job.params.get("size", DEFAULT_DUMP_SIZE))
+        result, _ = self.command(f"-data-read-memory-bytes {addr} {size}")
+        contents = re.search(r'contents="([0-9a-fA-F]*)"', result)
+        if not contents:
+            raise MIError(f"Réponse MI inattendue : {result}")
+        data = bytes.fromhex(contents.group(1))
+
+        output = job.params.get("output")
+        if output:
+            with open(output, "wb") as f:
+                f.write(data)
+        return {"addr": addr, "size": len(data), "output": output, "data": data}
+
+    def _python_job(self, job):
+        """Délègue la tâche au côté GDB (serve_job) et récupère le résultat JSON."""
+        payload = json.dumps({"kind": job.kind, "params": job.params})
+        _, console = self.console(f"python gdb_pool.serve_job({payload!r})", until_marker=True)
+        line = console[console.rindex(RESULT_MARKER) + len(RESULT_MARKER):].splitlines()[0]
+        result = json.loads(line)
+        if "error" in result:
+            raise MIError(f"[{self.name}] {job} : {result['error']}")
+        return result
+
+
+# ================= POOL =================
+
+class GdbPool:
+    """
+    Pool de workers GDB/MI résidents.
+
+    Les tâches sont placées dans une file partagée. Chaque worker libre prend en
+    priorité une tâche portant sur le binaire qu'il a déjà chargé, afin de ne
+    pas repayer le chargement des symboles.
+    """
+    def __init__(self, size=2, cwd=None):
+        self.workers = [MIWorker(f"gdb-{i}", cwd=cwd) for i in range(size)]
+        self._pending = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._threads = []
+        self._alive = size
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        for worker in self.workers:
+            thread = threading.Thread(target=self._worker_loop, args=(worker,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, kind, binary, **params):
+        """Soumet une tâche et renvoie un Future dont le résultat est un dict."""
+        for key in ("output",):
+            if params.get(key):
+                params[key] = os.path.abspath(params[key])
+        job = Job(kind, binary, **params)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Le pool est fermé.")
+            self._pending.append(job)
+            self._cond.notify_all()
+        return job.future
+
+    def run(self, kind, binary, **params):
+        """Version synchrone de submit()."""
+        return self.submit(kind, binary, **params).result()
+
+    def close(self, kill=False):
+        """
+        Ferme le pool.
+
+        Args:
+            kill (bool): Tue immédiatement les processus GDB au lieu d'attendre
+                la fin des tâches en cours (ex: solveur concurrent devenu inutile).
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if kill:
+            for worker in self.workers:
+                worker.kill()
+        for thread in self._threads:
+            thread.join()
+        with self._cond:
+            for job in self._pending:
+                job.future.cancel()
+            self._pending.clear()
+
+    def _next_job(self, worker):
+        """Choisit la prochaine tâche, en privilégiant l'affinité de binaire."""
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return None
+            for i, job in enumerate(self._pending):
+                if job.binary == worker.loaded_binary:
+                    return self._pending.pop(i)
+            return self._pending.pop(0)
+
+    def _worker_lost(self, worker):
+        """Retire un worker ; si c'était le dernier, les tâches en attente échouent."""
+        with self._cond:
+            self._alive -= 1
+            if self._alive > 0:
+                return
+            self._closed = True
+            for job in self._pending:
+                job.future.set_exception(MIError("Aucun worker GDB disponible."))
+            self._pending.clear()
+
+    def _worker_loop(self, worker):
+        try:
+            worker.start()
+        except (OSError, MIError) as e:
+            logging.error(f"[{worker.name}] Impossible de démarrer GDB : {e}")
+            self._worker_lost(worker)
+            return
+
+        while True:
+            job = self._next_job(worker)
+            if job is None:
+                break
+            if not job.future.set_running_or_notify_cancel():
+                continue
+
+            reset_peak_rss(worker.proc.pid)
+            t0 = time.perf_counter()
+            try:
+                result = worker.run(job)
+                result["elapsed"] = time.perf_counter() - t0
+                result["peak_rss_kb"] = read_peak_rss_kb(worker.proc.pid)
+                job.future.set_result(result)
+                logging.info(f"[{worker.name}] {job} terminé en {result['elapsed'] * 1000:.1f} ms")
+            except Exception as e:
+                job.future.set_exception(e)
+                if self._closed:
+                    break
+                if not worker.alive():
+                    logging.warning(f"[{worker.name}] Worker perdu, redémarrage...")
+                    try:
+                        worker.start()
+                    except (OSError, MIError) as e:
+                        logging.error(f"[{worker.name}] Redémarrage impossible : {e}")
+                        self._worker_lost(worker)
+                        return
+
+        worker.stop()
+
+
+# ================= CÔTÉ WORKER (exécuté dans GDB) =================
+
+def serve_job(payload):
+    """
+    Point d'entrée appelé dans le processus GDB par MIWorker._python_job.
+    Le résultat est renvoyé sur la sortie console, préfixé par RESULT_MARKER.
+    """
+    request = json.loads(payload)
+    kind, params = request["kind"], request["params"]
+
+    # Toute exception est renvoyée dans le résultat : l'hôte attend toujours le marqueur
+    try:
+        if kind == "extract-payload":
+            import extract_hidden
+            output = params.get("output") or extract_hidden.OUTPUT_FILENAME
+            ok = extract_hidden.run_extractor(output_filename=output, quit_gdb=False)
+            result = {"ok": ok, "output": output}
+        elif kind == "dynamic-solve":
+            import solve_dynamic
+            flag = solve_dynamic.run_solver(quit_gdb=False)
+            result = {"ok": len(flag) == solve_dynamic.FLAG_SIZE, "flag": flag}
+        elif kind == "capture-trace":
+            import solve_dynamic
+            output = params.get("output") or solve_dynamic.TRACE_FILENAME
+            ok = solve_dynamic.run_capture(trace_path=output, quit_gdb=False)
+            result = {"ok": ok, "output": output}
+        else:
+            raise ValueError(f"Type de tâche non géré côté GDB : {kind}")
+    except Exception as e:
+        result = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    print(RESULT_MARKER + json.dumps(result))
+
+
+# ================= MAIN EXECUTION =================
+
+def serve_stdin(pool):
+    """
+    Mode résident : lit une tâche JSON par ligne sur stdin et écrit un résultat
+    JSON par ligne sur stdout, dans l'ordre de fin des tâches. Le champ "id"
+    fourni par l'appelant est recopié dans le résultat.
+    Ex: {"id": 1, "kind": "dump-range", "binary": "hidden.bin", "output": "DAT.bin"}
+
+    Les logs doivent aller sur stderr (cf. main) : stdout ne contient que du JSON.
+    """
+    output_lock = threading.Lock()
+    futures = []
+
+    def emit(response):
+        with output_lock:
+            print(json.dumps(response), flush=True)
+
+    def on_done(job_id, future):
+        try:
+            result = future.result()
+            result.pop("data", None)
+            emit({"id": job_id, "ok": True, **result})
+        except Exception as e:
+            emit({"id": job_id, "ok": False, "error": str(e)})
+
+    logging.info("Pool prêt. En attente de tâches JSON sur stdin (Ctrl-D pour quitter).")
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        job_id = None
+        try:
+            request = json.loads(line)
+            job_id = request.pop("id", None)
+            kind, binary = request.pop("kind"), request.pop("binary")
+            future = pool.submit(kind, binary, **request)
+        except Exception as e:
+            emit({"id": job_id, "ok": False, "error": str(e)})
+            continue
+        future.add_done_callback(lambda f, job_id=job_id: on_done(job_id, f))
+        futures.append(future)
+
+    # Fin de stdin : on attend les tâches en cours avant de fermer le pool
+    wait(futures)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pool de workers GDB/MI résidents")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Nombre de processus GDB (défaut : 2 en mode serve, 1 sinon)")
+    sub = parser.add_subparsers(dest="kind", required=True)
+
+    p = sub.add_parser("extract-payload", help="Extraction du payload (cf. extract_hidden.py)")
+    p.add_argument("binary", nargs="?", default="24.bin")
+    p.add_argument("--output", default="hidden.bin")
+
+    p = sub.add_parser("dump-range", help="Dump d'une plage mémoire (cf. extract_DAT.py)")
+    p.add_argument("binary", nargs="?", default="hidden.bin")
+    p.add_argument("--addr", type=lambda v: int(v, 0), default=DEFAULT_DUMP_ADDR)
+    p.add_argument("--size", type=lambda v: int(v, 0), default=DEFAULT_DUMP_SIZE)
+    p.add_argument("--output", default="DAT.bin")
+
+    p = sub.add_parser("dynamic-solve", help="Résolution dynamique (cf. solve_dynamic.py)")
+    p.add_argument("binary", nargs="?", default="hidden.bin")
+
+    p = sub.add_parser("capture-trace", help="Capture d'une itération pour replay_oracle.py")
+    p.add_argument("binary", nargs="?", default="hidden.bin")
+    p.add_argument("--output", default="loop_trace.json")
+
+    sub.add_parser("serve", help="Mode résident : tâches JSON sur stdin")
+
+    args = parser.parse_args()
+
+    if args.kind == "serve":
+        # stdout est réservé aux résultats JSON
+        logging.getLogger().handlers[0].setStream(sys.stderr)
+
+    workers = args.workers or (2 if args.kind == "serve" else 1)
+    with GdbPool(size=workers) as pool:
+        if args.kind == "serve":
+            serve_stdin(pool)
+        else:
+            params = {k: v for k, v in vars(args).items() if k not in ("workers", "kind", "binary")}
+            result = pool.run(args.kind, args.binary, **params)
+            result.pop("data", None)
+            logging.info(f"Résultat : {result}")
@@ -1,155 +1,417 @@
-import sys
+import os
+import re
+import glob
+import json
+import time
+import hashlib
+import argparse
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from markdown_it import MarkdownIt
 from pygments import highlight
 from pygments.lexers import get_lexer_by_name, guess_lexer
 from pygments.formatters import HtmlFormatter
-from weasyprint import HTML, CSS
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
 
 # --- CONFIGURATION COULEURS ---
 STYLE_THEME = 'monokai'
 VSCODE_BG = "#1e1e1e"
 # ------------------------------
 
-def highlight_code(code, name, attrs):
+# --- CONFIGURATION CACHE ---
+CACHE_DIR = ".md_to_pdf_cache"
+HIGHLIGHT_CACHE_FILE = os.path.join(CACHE_DIR, "highlight.json")  # Blocs de code déjà colorés
+BUILD_CACHE_FILE = os.path.join(CACHE_DIR, "builds.json")          # Empreinte du dernier rendu par PDF
+HIGHLIGHT_CACHE_MAX = 1000  # Blocs conservés ; les moins récemment utilisés sont évincés
+WATCH_INTERVAL = 0.5  # Secondes entre deux vérifications en mode watch
+# ---------------------------
+
+# --- CONFIGURATION IMAGES ---
+PAGE_WIDTH_CM = 21.0   # A4
+PAGE_MARGIN_CM = 1.2
+IMAGE_DPI = 150        # Résolution cible à l'impression (0 = images d'origine)
+JPEG_QUALITY = 80
+CSS_PX_PER_INCH = 96   # WeasyPrint dimensionne les images à 96 px par pouce
+IMAGE_CACHE_DIR = os.path.join(CACHE_DIR, "img")
+# ----------------------------
+
+CSS_CONTENT = f"""
+@page {{
+    margin: {PAGE_MARGIN_CM}cm; 
+    size: A4;
+    @bottom-center {{
+        content: "Page " counter(page);
+        font-family: 'Segoe UI', sans-serif;
+        font-size: 10px;
+        color: #888;
+    }}
+}}
+body {{
+    font-family: 'Segoe UI', 'Roboto', 'Helvetica Neue', sans-serif;
+    font-size: 14px;
+    line-height: 1.35; 
+    color: #333;
+    background-color: #fff;
+    text-align: justify;
+    overflow-wrap: break-word; 
+    word-wrap: break-word;     
+    hyphens: auto;             
+}}
+a {{
+    overflow-wrap: break-word;
+    word-break: break-all;
+    color: #007acc;
+    text-decoration: none;
+}}
+h1 {{ 
+    font-size: 22px; 
+    color: #19242E; 
+    border-bottom: 3px solid #eee; 
+    padding-bottom: 5px;
+    margin-top: 0;
+    margin-bottom: 15px; 
+}}
+h2 {{ 
+    font-size: 17px; 
+    color: #2c3e50; 
+    margin-top: 20px; 
+    margin-bottom: 10px;
+    border-bottom: 1px solid #eee; 
+    padding-bottom: 3px;
+}}
+h3 {{ 
+    font-size: 15px; 
+    color: #3A5269; 
+    margin-top: 15px;
+    margin-bottom: 8px; 
+}}
+pre {{
+    background-color: {VSCODE_BG}; 
+    color: #d4d4d4;
+    padding: 10px; 
+    border-radius: 6px;
+    border: 1px solid #3c3c3c;
+    font-family: 'Fira Code', 'Consolas', 'Courier New', monospace;
+    font-size: 0.75em; 
+    line-height: 1.3; 
+    margin: 15px 0;   
+    overflow-x: hidden;
+    white-space: pre-wrap;
+    overflow-wrap: break-word;
+}}
+code {{
+    font-family: 'Fira Code', 'Consolas', monospace;
+    background-color: #f3f4f4;
+    padding: 2px 4px;
+    border-radius: 4px;
+    color: #e01e5a;
+    font-size: 0.9em;
+    overflow-wrap: break-word; 
+}}
+pre code {{
+    background-color: transparent;
+    color: inherit;
+    padding: 0;
+    font-size: 1em;
+}}
+blockquote {{
+    border-left: 4px solid #007acc;
+    background: #f9f9f9;
+    margin: 1em 0;
+    padding: 8px 15px;
+    font-style: italic;
+    color: #555;
+}}
+table {{
+    width: 100%;
+    border-collapse: collapse;
+    margin: 15px 0;
+    font-size: 0.95em;
+    table-layout: fixed;
+}}
+.center {{
+    text-align: center;
+    display: block;
+    margin: 10px 0; 
+    width: 100%;
+}}
+th, td {{ 
+    padding: 8px; 
+    border: 1px solid #ddd; 
+    overflow-wrap: break-word;
+}}
+th {{ background-color: #f8f9fa; font-weight: bold; text-align: left; }}
+p {{ margin-bottom: 10px; }} 
+img {{ max-width: 100%; height: auto; display: block; margin: 15px auto; border-radius: 5px; }}
+"""
+
+
+# Formatter unique, réutilisé pour tous les blocs
+FORMATTER = HtmlFormatter(style=STYLE_THEME, noclasses=True)
+
+_highlight_cache = None
+_highlight_used = {}      # Blocs utilisés depuis le dernier flush (clé -> HTML)
+_highlight_dirty = False  # Au moins un bloc nouvellement coloré depuis le dernier flush
+
+def _load_json(path):
     try:
-        lexer = get_lexer_by_name(name) if name else guess_lexer(code)
-    except:
-        lexer = get_lexer_by_name("text")
-    
-    formatter = HtmlFormatter(style=STYLE_THEME, noclasses=True)
-    return highlight(code, lexer, formatter)
-
-def markdown_to_pdf(input_file, output_file):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _update_json(path, updates, limit=None):
+    """
+    Fusionne updates dans le fichier JSON.
+    Lecture-fusion-écriture sous verrou (fcntl) et publication atomique
+    (os.replace) : plusieurs processus peuvent l'appeler en même temps.
+    Hors POSIX (pas de fcntl), l'écriture reste atomique mais sans verrou.
+
+    Les clés mises à jour passent en fin de fichier ; avec limit, les plus
+    anciennes sont supprimées au-delà de limit entrées.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(path + ".lock", 'w') as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        data = _load_json(path)
+        for key, value in updates.items():
+            data.pop(key, None)
+            data[key] = value
+        if limit is not None:
+            for key in list(data)[:max(0, len(data) - limit)]:
+                del data[key]
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+@lru_cache(maxsize=None)
+def get_lexer(name):
+    try:
+        return get_lexer_by_name(name)
+    except Exception:
+        return get_lexer_by_name("text")
+
+def highlight_code(code, name, attrs):
+    global _highlight_cache, _highlight_dirty
+    if _highlight_cache is None:
+        _highlight_cache = _load_json(HIGHLIGHT_CACHE_FILE)
+
+    # Clé : thème + langage + contenu (guess_lexer n'est appelé qu'une fois par bloc)
+    key = hashlib.sha256(f"{STYLE_THEME}\0{name}\0{code}".encode('utf-8')).hexdigest()
+    cached = _highlight_cache.pop(key, None)
+    if cached is not None:
+        # Réinsertion en fin de dictionnaire : ordre = utilisation la plus récente
+        _highlight_cache[key] = _highlight_used[key] = cached
+        return cached
+
+    if name:
+        lexer = get_lexer(name)
+    else:
+        try:
+            lexer = guess_lexer(code)
+        except Exception:
+            lexer = get_lexer("text")
+
+    html = highlight(code, lexer, FORMATTER)
+    _highlight_cache[key] = _highlight_used[key] = html
+    _highlight_dirty = True
+    # En mode watch, chaque modification d'un bloc ajoute une entrée : on borne la mémoire
+    for old_key in list(_highlight_cache)[:max(0, len(_highlight_cache) - HIGHLIGHT_CACHE_MAX)]:
+        del _highlight_cache[old_key]
+    return html
+
+def take_highlight_updates():
+    """
+    Renvoie les blocs utilisés depuis le dernier appel (vide si aucun bloc
+    n'a été nouvellement coloré) et remet le suivi à zéro.
+    """
+    global _highlight_used, _highlight_dirty
+    updates = _highlight_used if _highlight_dirty else {}
+    _highlight_used = {}
+    _highlight_dirty = False
+    return updates
+
+def flush_highlight_cache(updates=None):
+    """
+    Écrit les blocs utilisés dans le cache persistant. Ils y deviennent les
+    plus récents ; au-delà de HIGHLIGHT_CACHE_MAX, les plus anciens sont évincés.
+    """
+    if updates is None:
+        updates = take_highlight_updates()
+    if updates:
+        _update_json(HIGHLIGHT_CACHE_FILE, updates, limit=HIGHLIGHT_CACHE_MAX)
+
+@lru_cache(maxsize=None)
+def get_parser():
     try:
         import linkify_it
         enable_linkify = True
     except ImportError:
         enable_linkify = False
 
-    md = MarkdownIt("gfm-like", {
+    return MarkdownIt("gfm-like", {
         "linkify": enable_linkify,
         "html": True,
         "highlight": highlight_code
     })
 
+@lru_cache(maxsize=None)
+def get_stylesheet():
+    # Import différé : WeasyPrint n'est chargé que si un rendu est nécessaire
+    from weasyprint import CSS
+    return CSS(string=CSS_CONTENT)
+
+def referenced_images(html_body, base_dir="."):
+    """Chemins locaux des images référencées par le document (balises <img>)."""
+    images = []
+    for src in re.findall(r'<img[^>]+src="([^"]+)"', html_body):
+        if "://" not in src and not src.startswith("data:"):
+            images.append(os.path.join(base_dir, src))
+    return images
+
+def file_digest(path):
+    h = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+def printable_width_px(dpi):
+    """
+    Largeur max d'une image (max-width: 100%) dans la zone imprimable A4, en pixels.
+    Sous 96 dpi, une image réduite serait imprimée plus petite qu'avant : on borne.
+    """
+    return int((PAGE_WIDTH_CM - 2 * PAGE_MARGIN_CM) / 2.54 * max(dpi, CSS_PX_PER_INCH))
+
+def optimize_image(src, dpi):
+    """
+    Réduit une image à la largeur imprimée et la recompresse.
+    Le résultat est mis en cache (clé : contenu + paramètres) ; renvoie le
+    chemin de la copie optimisée, ou src si l'optimisation n'apporte rien.
+    """
+    try:
+        with open(src, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return src
+
+    key = hashlib.sha256(data + f"\0{printable_width_px(dpi)}\0{JPEG_QUALITY}".encode()).hexdigest()
+    for ext in (".jpg", ".png"):
+        cached = os.path.join(IMAGE_CACHE_DIR, key + ext)
+        if os.path.exists(cached):
+            return cached
+    marker = os.path.join(IMAGE_CACHE_DIR, key + ".orig")
+    if os.path.exists(marker):
+        return src
+
+    # Écriture dans un fichier temporaire propre au processus : un autre worker
+    # ne voit la copie qu'une fois complète et validée (os.replace)
+    os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+    tmp_path = os.path.join(IMAGE_CACHE_DIR, f"{key}.{os.getpid()}.tmp")
+    try:
+        with Image.open(src) as img:
+            # Le ré-encodage perd le tag EXIF d'orientation : on l'applique aux pixels
+            img = ImageOps.exif_transpose(img)
+            max_width = printable_width_px(dpi)
+            if img.width > max_width:
+                img = img.resize((max_width, round(img.height * max_width / img.width)), Image.LANCZOS)
+
+            # Transparence conservée en PNG, le reste en JPEG
+            if img.mode in ("RGBA", "LA") or "transparency" in img.info:
+                cached = os.path.join(IMAGE_CACHE_DIR, key + ".png")
+                img.save(tmp_path, "PNG", optimize=True)
+            else:
+                cached = os.path.join(IMAGE_CACHE_DIR, key + ".jpg")
+                img.convert("RGB").save(tmp_path, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    except Exception as e:
+        print(f"Avertissement : optimisation impossible pour '{src}' ({e})")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return src
+
+    # Copie plus lourde que l'original : on garde l'original (et on s'en souvient)
+    if os.path.getsize(tmp_path) >= len(data):
+        os.remove(tmp_path)
+        open(marker, 'w').close()
+        return src
+    os.replace(tmp_path, cached)
+    return cached
+
+def optimize_images(html_body, dpi, base_dir="."):
+    """Réécrit les <img src> du document vers les copies optimisées."""
+    if not dpi or Image is None:
+        return html_body
+
+    def replace(match):
+        src = match.group(2)
+        if "://" in src or src.startswith("data:"):
+            return match.group(0)
+        path = os.path.join(base_dir, src)
+        optimized = optimize_image(path, dpi)
+        if optimized == path:
+            return match.group(0)
+        return match.group(1) + os.path.abspath(optimized) + match.group(3)
+
+    return re.sub(r'(<img[^>]+src=")([^"]+)(")', replace, html_body)
+
+def markdown_to_pdf(input_file, output_file, force=False, dpi=IMAGE_DPI, flush=True):
+    """
+    Convertit un fichier Markdown en PDF.
+    Le rendu WeasyPrint est ignoré si le HTML, le CSS et les images sont
+    identiques au dernier rendu de output_file (sauf si force=True).
+    Les images sont réduites à dpi points par pouce avant le rendu (0 = désactivé).
+    Avec flush=False, le cache de coloration n'est pas écrit (cf. batch_convert).
+
+    Les chemins relatifs (images) sont résolus depuis le dossier du Markdown.
+
+    Retourne la liste des fichiers dont dépend le document (Markdown + images),
+    ou None en cas d'erreur.
+    """
     try:
         with open(input_file, 'r', encoding='utf-8') as f:
             content = f.read()
     except FileNotFoundError:
         print(f"Erreur : Impossible de trouver le fichier '{input_file}'")
-        return
-
-    html_body = md.render(content)
-
-    css_content = f"""
-    @page {{
-        margin: 1.2cm; 
-        size: A4;
-        @bottom-center {{
-            content: "Page " counter(page);
-            font-family: 'Segoe UI', sans-serif;
-            font-size: 10px;
-            color: #888;
-        }}
-    }}
-    body {{
-        font-family: 'Segoe UI', 'Roboto', 'Helvetica Neue', sans-serif;
-        font-size: 14px;
-        line-height: 1.35; 
-        color: #333;
-        background-color: #fff;
-        text-align: justify;
-        overflow-wrap: break-word; 
-        word-wrap: break-word;     
-        hyphens: auto;             
-    }}
-    a {{
-        overflow-wrap: break-word;
-        word-break: break-all;
-        color: #007acc;
-        text-decoration: none;
-    }}
-    h1 {{ 
-        font-size: 22px; 
-        color: #19242E; 
-        border-bottom: 3px solid #eee; 
-        padding-bottom: 5px;
-        margin-top: 0;
-        margin-bottom: 15px; 
-    }}
-    h2 {{ 
-        font-size: 17px; 
-        color: #2c3e50; 
-        margin-top: 20px; 
-        margin-bottom: 10px;
-        border-bottom: 1px solid #eee; 
-        padding-bottom: 3px;
-    }}
-    h3 {{ 
-        font-size: 15px; 
-        color: #3A5269; 
-        margin-top: 15px;
-        margin-bottom: 8px; 
-    }}
-    pre {{
-        background-color: {VSCODE_BG}; 
-        color: #d4d4d4;
-        padding: 10px; 
-        border-radius: 6px;
-        border: 1px solid #3c3c3c;
-        font-family: 'Fira Code', 'Consolas', 'Courier New', monospace;
-        font-size: 0.75em; 
-        line-height: 1.3; 
-        margin: 15px 0;   
-        overflow-x: hidden;
-        white-space: pre-wrap;
-        overflow-wrap: break-word;
-    }}
-    code {{
-        font-family: 'Fira Code', 'Consolas', monospace;
-        background-color: #f3f4f4;
-        padding: 2px 4px;
-        border-radius: 4px;
-        color: #e01e5a;
-        font-size: 0.9em;
-        overflow-wrap: break-word; 
-    }}
-    pre code {{
-        background-color: transparent;
-        color: inherit;
-        padding: 0;
-        font-size: 1em;
-    }}
-    blockquote {{
-        border-left: 4px solid #007acc;
-        background: #f9f9f9;
-        margin: 1em 0;
-        padding: 8px 15px;
-        font-style: italic;
-        color: #555;
-    }}
-    table {{
-        width: 100%;
-        border-collapse: collapse;
-        margin: 15px 0;
-        font-size: 0.95em;
-        table-layout: fixed;
-    }}
-    .center {{
-        text-align: center;
-        display: block;
-        margin: 10px 0; 
-        width: 100%;
-    }}
-    th, td {{ 
-        padding: 8px; 
-        border: 1px solid #ddd; 
-        overflow-wrap: break-word;
-    }}
-    th {{ background-color: #f8f9fa; font-weight: bold; text-align: left; }}
-    p {{ margin-bottom: 10px; }} 
-    img {{ max-width: 100%; height: auto; display: block; margin: 15px auto; border-radius: 5px; }}
-    """
+        return None
+
+    html_body = get_parser().render(content)
+    if flush:
+        flush_highlight_cache()
+
+    base_dir = os.path.dirname(os.path.abspath(input_file))
+    images = referenced_images(html_body, base_dir)
+    dependencies = [input_file] + images
+
+    # Empreinte du rendu : HTML + CSS + contenu des images + réglages d'optimisation
+    fingerprint = hashlib.sha256((html_body + CSS_CONTENT).encode('utf-8'))
+    fingerprint.update(f"{dpi if Image else 0}:{JPEG_QUALITY}".encode('utf-8'))
+    for image in images:
+        fingerprint.update(f"{os.path.relpath(image, base_dir)}:{file_digest(image)}".encode('utf-8'))
+    fingerprint = fingerprint.hexdigest()
+
+    builds = _load_json(BUILD_CACHE_FILE)
+    build_key = os.path.abspath(output_file)
+    if not force and os.path.exists(output_file) and builds.get(build_key) == fingerprint:
+        print(f"'{output_file}' est à jour, rendu ignoré.")
+        return dependencies
+
+    if dpi and Image is None:
+        print("Pillow n'est pas installé : images d'origine utilisées (pip install pillow).")
+    html_body = optimize_images(html_body, dpi, base_dir)
 
     full_html = f"""
     <!DOCTYPE html>
@@ -161,17 +423,129 @@ def markdown_to_pdf(input_file, output_file):
 
     print(f"Conversion de '{input_file}' en cours...")
     try:
-        html_obj = HTML(string=full_html, base_url=".")
-        css_obj = CSS(string=css_content)
-        html_obj.write_pdf(output_file, stylesheets=[css_obj])
+        from weasyprint import HTML
+        html_obj = HTML(string=full_html, base_url=base_dir)
+        html_obj.write_pdf(output_file, stylesheets=[get_stylesheet()])
         print(f"Fichier PDF généré : {output_file}")
     except Exception as e:
         print(f"Erreur WeasyPrint : {e}")
+        return None
+
+    _update_json(BUILD_CACHE_FILE, {build_key: fingerprint})
+    return dependencies
+
+def _mtimes(paths):
+    stamps = {}
+    for path in paths:
+        try:
+            stamps[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            stamps[path] = None
+    return stamps
+
+def watch(input_file, output_file, dpi=IMAGE_DPI):
+    """Re-génère le PDF dès que le Markdown ou une image référencée est modifié."""
+    dependencies = markdown_to_pdf(input_file, output_file, dpi=dpi) or [input_file]
+    stamps = _mtimes(dependencies)
+    print(f"Surveillance de {len(dependencies)} fichier(s) (Ctrl-C pour quitter)...")
+    try:
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            current = _mtimes(dependencies)
+            if current == stamps:
+                continue
+            t0 = time.perf_counter()
+            dependencies = markdown_to_pdf(input_file, output_file, dpi=dpi) or dependencies
+            stamps = _mtimes(dependencies)
+            print(f"Rendu terminé en {time.perf_counter() - t0:.2f}s")
+    except KeyboardInterrupt:
+        pass
+
+def output_path(input_file):
+    return input_file.rsplit('.', 1)[0] + ".pdf"
+
+def expand_inputs(patterns):
+    """
+    Développe les fichiers, motifs glob et dossiers (recherche récursive des *.md).
+    Un même fichier atteint par plusieurs chemins ('./a.md', 'a.md') n'est gardé
+    qu'une fois, sinon deux workers écriraient le même PDF.
+    """
+    files = []
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(pattern, "**", "*.md"), recursive=True))
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        for path in matches:
+            real = os.path.realpath(path)
+            if real not in seen:
+                seen.add(real)
+                files.append(path)
+    return files
+
+def init_worker():
+    """Initialisation d'un worker batch : imports lourds, CSS et parser créés une seule fois."""
+    get_parser()
+    try:
+        get_stylesheet()
+    except Exception as e:
+        # L'erreur sera remontée fichier par fichier par markdown_to_pdf
+        print(f"Erreur WeasyPrint : {e}")
+
+def _convert(input_file, force, dpi):
+    t0 = time.perf_counter()
+    ok = markdown_to_pdf(input_file, output_path(input_file), force=force, dpi=dpi, flush=False) is not None
+    # Les blocs colorés remontent au processus principal, qui écrit le cache une seule fois
+    return input_file, ok, time.perf_counter() - t0, take_highlight_updates()
+
+def batch_convert(inputs, jobs=None, force=False, dpi=IMAGE_DPI):
+    """Convertit plusieurs documents en parallèle et affiche le temps par fichier."""
+    t0 = time.perf_counter()
+    results = []
+    highlight_updates = {}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker) as executor:
+        futures = [executor.submit(_convert, path, force, dpi) for path in inputs]
+        for future in as_completed(futures):
+            try:
+                input_file, ok, elapsed, updates = future.result()
+                results.append((input_file, ok, elapsed))
+                highlight_updates.update(updates)
+            except Exception as e:
+                print(f"Erreur : {e}")
+    flush_highlight_cache(highlight_updates)
+    total = time.perf_counter() - t0
+
+    print("\n--- Résumé ---")
+    for input_file, ok, elapsed in sorted(results):
+        print(f"{'OK    ' if ok else 'ÉCHEC '} {elapsed:6.2f}s  {input_file}")
+    failed = sum(1 for _, ok, _ in results if not ok) + len(inputs) - len(results)
+    print(f"{len(inputs)} fichier(s), {failed} échec(s), {total:.2f}s au total")
+    return results
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        filename = sys.argv[1]
-        output_name = filename.rsplit('.', 1)[0] + ".pdf"
-        markdown_to_pdf(filename, output_name)
+    parser = argparse.ArgumentParser(description="Conversion Markdown -> PDF (WeasyPrint)")
+    parser.add_argument("inputs", nargs="+", help="Fichiers Markdown, motifs glob ou dossiers (ex: README.md)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Nombre de processus en mode batch (défaut : nombre de cœurs)")
+    parser.add_argument("--watch", action="store_true", help="Re-génère le PDF à chaque modification")
+    parser.add_argument("--force", action="store_true", help="Ignore le cache et force le rendu")
+    parser.add_argument("--dpi", type=int, default=IMAGE_DPI,
+                        help=f"Résolution des images à l'impression (défaut : {IMAGE_DPI}, minimum effectif "
+                             f"{CSS_PX_PER_INCH}, 0 = images d'origine)")
+
+    args = parser.parse_args()
+    inputs = expand_inputs(args.inputs)
+
+    if not inputs:
+        print("Aucun fichier Markdown trouvé.")
+    elif args.watch:
+        if len(inputs) > 1:
+            parser.error("--watch ne prend en charge qu'un seul fichier.")
+        watch(inputs[0], output_path(inputs[0]), dpi=args.dpi)
+    elif len(inputs) == 1:
+        markdown_to_pdf(inputs[0], output_path(inputs[0]), force=args.force, dpi=args.dpi)
     else:
-        print("Usage: python md_to_pdf.py mon_fichier.md")
\ No newline at end of file
+        batch_convert(inputs, jobs=args.jobs, force=args.force, dpi=args.dpi)
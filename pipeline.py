@@ -0,0 +1,230 @@
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import threading
+from pathlib import Path
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+
+import solve_static
+from gdb_pool import GdbPool, reset_peak_rss, read_peak_rss_kb
+
+# ================= CONFIGURATION DU LOGGING =================
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s',
+    datefmt='%H:%M:%S',
+    stream=sys.stdout
+)
+
+# ================= CONFIGURATION DU PIPELINE =================
+CACHE_FILENAME  = ".pipeline_cache.json"  # Empreintes des entrées/sorties de chaque étape
+LOADER_FILENAME = "24.bin"
+HIDDEN_FILENAME = "hidden.bin"
+DAT_FILENAME    = "DAT.bin"
+FLAG_FILENAME   = "flag.txt"
+
+# ================= UTILITAIRES =================
+
+def file_digest(path) -> str:
+    """Empreinte SHA-256 du contenu d'un fichier (None s'il n'existe pas)."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+# ================= ÉTAPES =================
+
+class Stage:
+    """
+    Étape du pipeline.
+
+    Args:
+        name (str): Nom de l'étape (clé du cache).
+        inputs (list): Fichiers lus par l'étape.
+        outputs (list): Fichiers produits par l'étape.
+        action (callable): Fonction action(pool) -> dict exécutant l'étape.
+    """
+    def __init__(self, name, inputs, outputs, action):
+        self.name = name
+        self.inputs = [Path(p) for p in inputs]
+        self.outputs = [Path(p) for p in outputs]
+        self.action = action
+
+    def cache_key(self):
+        """Clé dérivée du nom de l'étape et du contenu de ses entrées."""
+        h = hashlib.sha256(self.name.encode())
+        for path in self.inputs:
+            digest = file_digest(path)
+            if digest is None:
+                raise FileNotFoundError(f"Entrée manquante pour '{self.name}' : {path}")
+            h.update(f"{path.name}:{digest}".encode())
+        return h.hexdigest()
+
+    def is_fresh(self, entry, key):
+        """L'étape est à jour si ses entrées n'ont pas changé et ses sorties sont intactes."""
+        if not entry or entry.get("key") != key:
+            return False
+        return all(file_digest(path) == entry["outputs"].get(str(path)) for path in self.outputs)
+
+
+def action_extract(pool):
+    result = pool.run("extract-payload", LOADER_FILENAME, output=HIDDEN_FILENAME)
+    if not result["ok"]:
+        raise RuntimeError("Aucun ELF détecté lors de l'extraction.")
+    return result
+
+def action_dump(pool):
+    return pool.run("dump-range", HIDDEN_FILENAME, output=DAT_FILENAME)
+
+def action_solve(pool):
+    """
+    Lance les solveurs statique et dynamique en concurrence.
+    Le premier flag obtenu est retenu ; l'autre solveur est abandonné.
+    """
+    static_future = Future()
+
+    def run_static():
+        reset_peak_rss()
+        try:
+            found = solve_static.find_flag(Path(DAT_FILENAME).read_bytes(), progress=False)
+            if found is None:
+                raise RuntimeError("Aucune seed valide.")
+            seed, flag = found
+            static_future.set_result({"ok": True, "flag": flag, "seed": seed,
+                                      "peak_rss_kb": read_peak_rss_kb(),
+                                      "peak_rss_scope": "pipeline"})
+        except Exception as e:
+            static_future.set_exception(e)
+
+    threading.Thread(target=run_static, daemon=True).start()
+    try:
+        dynamic_future = pool.submit("dynamic-solve", HIDDEN_FILENAME)
+    except RuntimeError as e:
+        # Pool indisponible (GDB absent) : le solveur statique court seul
+        dynamic_future = Future()
+        dynamic_future.set_exception(e)
+
+    racers = {static_future: "statique", dynamic_future: "dynamique"}
+    pending = set(racers)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None and future.result().get("ok"):
+                result = future.result()
+                result["winner"] = racers[future]
+                Path(FLAG_FILENAME).write_text(result["flag"] + "\n")
+                return result
+            logging.warning(f"Solveur {racers[future]} en échec : {future.exception() or future.result()}")
+    raise RuntimeError("Aucun solveur n'a trouvé le flag.")
+
+
+STAGES = [
+    Stage("extract", [LOADER_FILENAME], [HIDDEN_FILENAME], action_extract),
+    Stage("dump",    [HIDDEN_FILENAME], [DAT_FILENAME],    action_dump),
+    Stage("solve",   [HIDDEN_FILENAME, DAT_FILENAME], [FLAG_FILENAME], action_solve),
+]
+
+# ================= ORCHESTRATION =================
+
+def load_cache():
+    try:
+        return json.loads(Path(CACHE_FILENAME).read_text())
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+    Path(CACHE_FILENAME).write_text(json.dumps(cache, indent=2))
+
+def run_pipeline(start_at=None, force=False, workers=2):
+    """
+    Exécute les étapes dans l'ordre, en sautant celles dont les entrées sont inchangées.
+
+    Args:
+        start_at (str): Nom de la première étape à considérer (ex: 'dump' si hidden.bin existe déjà).
+        force (bool): Ignore le cache et ré-exécute toutes les étapes.
+        workers (int): Nombre de workers GDB du pool.
+
+    Returns:
+        list: Rapport par étape (statut, durée, pic mémoire).
+    """
+    names = [stage.name for stage in STAGES]
+    stages = STAGES[names.index(start_at):] if start_at else STAGES
+
+    cache = load_cache()
+    report = []
+    pool = GdbPool(size=workers)
+    pool_started = False
+
+    try:
+        for stage in stages:
+            key = stage.cache_key()
+            if not force and stage.is_fresh(cache.get(stage.name), key):
+                logging.info(f"[{stage.name}] Entrées inchangées, étape ignorée.")
+                report.append({"stage": stage.name, "status": "cache"})
+                continue
+
+            if not pool_started:
+                pool.start()
+                pool_started = True
+
+            logging.info(f"[{stage.name}] Exécution...")
+            t0 = time.perf_counter()
+            result = stage.action(pool)
+            elapsed = time.perf_counter() - t0
+
+            # Étapes GDB : pic du processus GDB lui-même, pas du programme débogué
+            entry = {"stage": stage.name, "status": "exécutée", "elapsed": elapsed,
+                     "peak_rss_kb": result.get("peak_rss_kb"),
+                     "peak_rss_scope": result.get("peak_rss_scope", "GDB")}
+            if "winner" in result:
+                entry["status"] = f"exécutée ({result['winner']})"
+            report.append(entry)
+
+            cache[stage.name] = {
+                "key": key,
+                "outputs": {str(path): file_digest(path) for path in stage.outputs},
+                "last_run": {"elapsed": elapsed, "peak_rss_kb": entry["peak_rss_kb"],
+                             "peak_rss_scope": entry["peak_rss_scope"]},
+            }
+            save_cache(cache)
+    finally:
+        # Le solveur perdant (GDB et son inferior) est tué plutôt qu'attendu
+        if pool_started:
+            pool.close(kill=True)
+
+    return report
+
+def print_report(report):
+    logging.info("--- Rapport du pipeline ---")
+    for entry in report:
+        if entry["status"] == "cache":
+            logging.info(f"{entry['stage']:<8} | cache")
+            continue
+        peak = entry.get("peak_rss_kb")
+        peak_str = f"{peak / 1024:.1f} Mo" if peak else "n/a"
+        logging.info(f"{entry['stage']:<8} | {entry['status']:<22} | {entry['elapsed']:.2f}s | "
+                     f"pic RSS ({entry['peak_rss_scope']}) {peak_str}")
+
+# ================= MAIN EXECUTION =================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline complet 24.bin -> flag avec cache par étape")
+    parser.add_argument("--start-at", choices=[stage.name for stage in STAGES],
+                        help="Première étape à exécuter (les fichiers précédents doivent exister)")
+    parser.add_argument("--force", action="store_true", help="Ignore le cache")
+    parser.add_argument("--workers", type=int, default=2, help="Nombre de workers GDB")
+
+    args = parser.parse_args()
+
+    report = run_pipeline(start_at=args.start_at, force=args.force, workers=args.workers)
+    print_report(report)
+    flag_path = Path(FLAG_FILENAME)
+    if flag_path.exists():
+        logging.warning(f"FLAG : {flag_path.read_text().strip()}")
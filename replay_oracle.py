@@ -0,0 +1,133 @@
+import sys
+import json
+import logging
+import argparse
+from pathlib import Path
+
+from solve_static import encrypt_byte, FLAG_SIGNATURE
+
+# ================= CONFIGURATION DU LOGGING =================
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s',
+    datefmt='%H:%M:%S',
+    stream=sys.stdout
+)
+
+# ================= CONFIGURATION =================
+TRACE_FILENAME = "loop_trace.json"   # Produit par solve_dynamic.run_capture()
+CHAR_RANGE     = range(32, 127)      # Même plage que solve_dynamic.py (ASCII imprimable)
+
+# ================= ORACLE HORS-LIGNE =================
+
+class ReplayOracle:
+    """
+    Oracle hors-ligne de la boucle de vérification.
+
+    Il ne rejoue pas d'instructions enregistrées : c'est le modèle de
+    FUN_004029f9 établi par l'analyse statique (solve_static.encrypt_byte),
+    paramétré par ce que la capture a relevé dans le processus : la seed
+    d'intégrité et le tableau de référence.
+
+    L'échantillon capturé (entrée, index, sortie, verdict) sert uniquement de
+    contrôle : le modèle doit reproduire exactement l'octet renvoyé par le
+    binaire, et le verdict enregistré doit correspondre à la comparaison entre
+    cet octet et le tableau.
+
+    Args:
+        data (dict): Contenu du fichier de trace.
+    """
+    def __init__(self, data):
+        self.seed = data["transform"]["seed"]
+        self.expected = bytes.fromhex(data["expected"])
+        self._solved = {}
+
+        sample = data["transform"]
+        index = sample["index"]
+        if index != data["loop_index"]:
+            raise ValueError("Trace incohérente : index de transformation différent de l'index de boucle.")
+        if not 0 <= index < len(self.expected):
+            raise ValueError(f"Trace incohérente : index {index} hors du tableau de référence.")
+
+        # Contrôle du modèle (clé additive fixée par l'analyse statique, non ajustée)
+        predicted = self.transform(sample["input_byte"], index)
+        if predicted != sample["output_byte"]:
+            raise ValueError(f"Le modèle ne reproduit pas la transformation capturée "
+                             f"(prévu {predicted:#04x}, observé {sample['output_byte']:#04x}).")
+
+        # Contrôle de la trace : verdict enregistré vs comparaison observée
+        if (sample["output_byte"] == self.expected[index]) != (data["verdict"] == 0):
+            raise ValueError("Trace incohérente : le verdict [rbp-0x14] ne correspond pas "
+                             "à la comparaison entre l'octet transformé et le tableau.")
+
+    @classmethod
+    def load(cls, path):
+        return cls(json.loads(Path(path).read_text()))
+
+    def transform(self, byte, index):
+        """Modèle de FUN_004029f9(byte, index, seed)."""
+        return encrypt_byte(byte, index, self.seed)
+
+    def is_valid(self, byte, index):
+        """True si le caractère est accepté à cet index ([rbp-0x14] == 0)."""
+        return self.transform(byte, index) == self.expected[index]
+
+    def solve_index(self, index):
+        """Premier caractère imprimable validé à cet index (même ordre que solve_dynamic.py)."""
+        if index not in self._solved:
+            self._solved[index] = next((chr(byte) for byte in CHAR_RANGE if self.is_valid(byte, index)), None)
+        return self._solved[index]
+
+    def solve(self):
+        """Recherche complète du flag, caractère par caractère."""
+        flag = ""
+        for index in range(len(self.expected)):
+            char = self.solve_index(index)
+            if char is None:
+                logging.error(f"Espace de recherche épuisé à l'index {index}. Arrêt.")
+                break
+            flag += char
+        return flag
+
+# ================= MAIN EXECUTION =================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Oracle hors-ligne paramétré par une itération capturée")
+    parser.add_argument("--trace", default=TRACE_FILENAME, help="Fichier de trace (cf. solve_dynamic.py, mode capture)")
+    parser.add_argument("--check", nargs=2, metavar=("CHAR", "INDEX"),
+                        help="Affiche le verdict pour un caractère et un index donnés")
+
+    args = parser.parse_args()
+
+    if not Path(args.trace).exists():
+        logging.error(f"Le fichier '{args.trace}' est introuvable.")
+        logging.info("Conseil : gdb -q -ex 'set $capture = 1' -x solve_dynamic.py hidden.bin")
+        sys.exit(1)
+
+    try:
+        oracle = ReplayOracle.load(args.trace)
+    except (ValueError, KeyError) as e:
+        logging.error(f"Trace invalide : {e}")
+        sys.exit(1)
+    logging.info(f"Trace chargée : seed {hex(oracle.seed)}, {len(oracle.expected)} octets de référence.")
+
+    if args.check:
+        char, index = args.check
+        try:
+            index = int(index, 0)
+        except ValueError:
+            index = None
+        if len(char) != 1 or ord(char) > 0xFF:
+            logging.error(f"CHAR doit être un unique caractère sur un octet (reçu : '{char}').")
+            sys.exit(1)
+        if index is None or not 0 <= index < len(oracle.expected):
+            logging.error(f"INDEX doit être un entier entre 0 et {len(oracle.expected) - 1}.")
+            sys.exit(1)
+        verdict = "valide ([rbp-0x14] == 0)" if oracle.is_valid(ord(char), index) else "invalide ([rbp-0x14] != 0)"
+        logging.info(f"'{char}' à l'index {index} : {verdict}")
+    else:
+        flag = oracle.solve()
+        if FLAG_SIGNATURE in flag:
+            logging.warning(f"FLAG REJOUÉ : {flag}")
+        else:
+            logging.error(f"Résultat sans signature {FLAG_SIGNATURE} : {flag}")
@@ -1,6 +1,8 @@
+import os
 import gdb
 import logging
 import sys
+import json
 import argparse
 from tqdm import tqdm
 
@@ -20,6 +22,11 @@ ADDR_CHECK_JUMP  = 0x402d4d  # Instruction conditionnelle vérifiant la validit
 ADDR_GET_BUFFER  = 0x402c55  # Instruction suivant l'allocation du buffer utilisateur
 ADDR_ANTI_PTRACE = 0x402bcd  # Appel ptrace() pour anti-debug
 ADDR_ANTI_TIME   = 0x402c21  # Vérification temporelle (RDTSC/Time)
+ADDR_TRANSFORM   = 0x4029f9  # FUN_004029f9 : transform_char(input[i], i, seed)
+ADDR_EXPECTED    = 0x4a60e0  # Tableau chiffré lu par la boucle (cf. extract_DAT.py)
+
+# Fichier de trace produit par le mode capture (cf. replay_oracle.py)
+TRACE_FILENAME = "loop_trace.json"
 
 
 # ================= ÉTAT DU PROCESSUS =================
@@ -169,11 +176,93 @@ class AntiDebugBypass(gdb.Breakpoint):
         gdb.execute("set $rax = 0")
         return False
 
+# ================= CAPTURE D'UNE ITÉRATION (REPLAY) =================
+
+class LoopTrace:
+    """Observations d'une itération de la boucle, sérialisées dans TRACE_FILENAME."""
+    def __init__(self):
+        self.transform_call = None    # Arguments et retour de FUN_004029f9
+        self.return_bp = None
+        self.done = False
+
+trace = LoopTrace()
+
+class TransformEntryBreakpoint(gdb.Breakpoint):
+    """
+    Breakpoint positionné à l'entrée de FUN_004029f9 (ADDR_TRANSFORM).
+    Responsabilité : Relever les arguments (System V : $rdi, $rsi, $rdx) et
+    poser un breakpoint matériel sur l'adresse de retour (un 'finish' logiciel
+    écrirait 0xCC et fausserait la seed d'intégrité).
+    """
+    def stop(self):
+        trace.transform_call = {
+            "input_byte": int(gdb.parse_and_eval("$rdi")) & 0xFF,
+            "index": int(gdb.parse_and_eval("$rsi")) & 0xFFFFFFFF,
+            "seed": int(gdb.parse_and_eval("$rdx")) & 0xFFFFFFFF,
+        }
+        return_addr = int(gdb.parse_and_eval("*(unsigned long*)$rsp"))
+        trace.return_bp = TransformReturnBreakpoint(f"*{return_addr}", type=gdb.BP_HARDWARE_BREAKPOINT, temporary=True)
+        self.enabled = False
+        return False
+
+class TransformReturnBreakpoint(gdb.Breakpoint):
+    """Relève l'octet transformé renvoyé dans $al."""
+    def stop(self):
+        trace.transform_call["output_byte"] = int(gdb.parse_and_eval("$rax")) & 0xFF
+        return False
+
+class CaptureCheckBreakpoint(gdb.Breakpoint):
+    """
+    Breakpoint positionné sur ADDR_CHECK_JUMP.
+    Responsabilité : Relever le verdict [rbp-0x14] et le tableau de référence lu
+    par la boucle, puis écrire la trace.
+    """
+    def __init__(self, spec, trace_path, **kwargs):
+        super().__init__(spec, **kwargs)
+        self.trace_path = trace_path
+
+    def stop(self):
+        if trace.transform_call is None or "output_byte" not in trace.transform_call:
+            logging.error("Vérification atteinte sans appel complet à la fonction de transformation.")
+            return True
+
+        inferior = gdb.selected_inferior()
+        expected = inferior.read_memory(ADDR_EXPECTED, FLAG_SIZE).tobytes()
+
+        data = {
+            "binary": gdb.current_progspace().filename,
+            "loop": [ADDR_LOOP_START, ADDR_CHECK_JUMP],
+            "expected_addr": ADDR_EXPECTED,
+            "expected": expected.hex(),
+            "transform": trace.transform_call,
+            "loop_index": int(gdb.parse_and_eval("*(int*)($rbp-0x18)")),
+            "verdict": int(gdb.parse_and_eval("*(int*)($rbp-0x14)")),
+        }
+        with open(self.trace_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+        trace.done = True
+        logging.info(f"Trace d'une itération écrite dans '{self.trace_path}' "
+                     f"(seed {hex(data['transform']['seed'])}).")
+        return True # Arrêt : la capture est terminée
+
+class CaptureInitBreakpoint(gdb.Breakpoint):
+    """Variante d'InitializationBreakpoint installant les breakpoints de capture."""
+    def __init__(self, spec, trace_path, **kwargs):
+        super().__init__(spec, **kwargs)
+        self.trace_path = trace_path
+
+    def stop(self):
+        gdb.execute("del")
+        logging.info("Installation des breakpoints de capture (transformation + vérification).")
+        TransformEntryBreakpoint(f"*{ADDR_TRANSFORM}", type=gdb.BP_HARDWARE_BREAKPOINT)
+        CaptureCheckBreakpoint(f"*{ADDR_CHECK_JUMP}", self.trace_path, type=gdb.BP_HARDWARE_BREAKPOINT)
+        return False
+
 # ================= MAIN EXECUTION =================
 
-def run_solver():
-    logging.info("Préparation de l'environnement GDB...")
-    
+def load_target():
+    """Utilise le binaire passé à GDB, ou charge hidden.bin par défaut."""
     target_filename = "hidden.bin" # Défaut
     
     try:
@@ -191,10 +280,15 @@ def run_solver():
         except gdb.error as e:
             logging.error(f"Impossible de charger {target_filename}: {e}")
             logging.info("Conseil : Dumper le fichier hidden.bin si ce fichier n'existe pas.")
-            return
-    
-    # Génération du fichier d'entrée (Placeholder)
-    with open("input.txt", "w") as f:
+            return False
+    return True
+
+def start_process():
+    """Démarre le processus (starti) avec l'entrée placeholder et les contournements anti-debug."""
+    # Génération du fichier d'entrée (Placeholder), propre à ce processus GDB :
+    # plusieurs workers du pool peuvent lancer le programme en parallèle
+    input_path = f"input.{os.getpid()}.txt"
+    with open(input_path, "w") as f:
         f.write(" " * FLAG_SIZE) # Remplissage avec des espaces
     
     # Configuration GDB
@@ -205,22 +299,84 @@ def run_solver():
     
 
     # Configuration de l'entrée standard du processus
-    logging.info("Configuration de l'entrée standard (stdin) via input.txt")
-    gdb.execute("set args < input.txt")
+    logging.info(f"Configuration de l'entrée standard (stdin) via {input_path}")
+    gdb.execute(f"set args < {input_path}")
 
     logging.info("Démarrage du processus en mode 'starti'...")
-    gdb.execute("starti")
+    try:
+        gdb.execute("starti")
+    finally:
+        # Le shell a déjà ouvert la redirection : le fichier n'est plus nécessaire
+        os.remove(input_path)
 
     # Installation des hooks de phase 1
     logging.info("Installation des Hooks de contournement et d'initialisation.")
     AntiDebugBypass(f"*{ADDR_ANTI_PTRACE}", type=gdb.BP_HARDWARE_BREAKPOINT)
     AntiDebugBypass(f"*{ADDR_ANTI_TIME}", type=gdb.BP_HARDWARE_BREAKPOINT)
+
+
+def run_solver(quit_gdb=True):
+    """
+    Lance la résolution dynamique sur le binaire chargé (ou hidden.bin).
+
+    Args:
+        quit_gdb (bool): Quitte GDB à la fin. Mettre à False lorsque le script
+            est piloté par un worker résident (gdb_pool.py).
+
+    Returns:
+        str: Le flag reconstitué (éventuellement partiel).
+    """
+    global state
+    state = ProcessState()
+    state.saved_context = {"rsp": 0, "rbp": 0}
+
+    logging.info("Préparation de l'environnement GDB...")
+    if not load_target():
+        return ""
+
+    start_process()
     InitializationBreakpoint(f"*{ADDR_GET_BUFFER}", type=gdb.BP_HARDWARE_BREAKPOINT)
 
     logging.info("Lancement de l'exécution continue. Le bruteforce démarrera automatiquement.")
     gdb.execute("continue")
     logging.warning(f"FLAG COMPLET TROUVÉ : {state.found_flag}")
-    gdb.execute("q")
+    if quit_gdb:
+        gdb.execute("q")
+    return state.found_flag
+
+def run_capture(trace_path=TRACE_FILENAME, quit_gdb=True):
+    """
+    Capture les paramètres d'une seule itération de la boucle de vérification
+    (seed, tableau de référence, échantillon de transformation, verdict) pour
+    l'oracle hors-ligne (replay_oracle.py), sans aucun rembobinage.
+
+    Args:
+        trace_path (str): Fichier de trace à écrire.
+        quit_gdb (bool): Quitte GDB à la fin.
+
+    Returns:
+        bool: True si la trace a été écrite.
+    """
+    global trace
+    trace = LoopTrace()
+
+    logging.info("Préparation de l'environnement GDB (mode capture)...")
+    if not load_target():
+        return False
+
+    start_process()
+    CaptureInitBreakpoint(f"*{ADDR_GET_BUFFER}", trace_path, type=gdb.BP_HARDWARE_BREAKPOINT)
+
+    gdb.execute("continue")
+    if not trace.done:
+        logging.error("Le programme s'est arrêté avant la fin de la capture.")
+    if quit_gdb:
+        gdb.execute("q")
+    return trace.done
     
 if __name__ == "__main__":
-    run_solver()
\ No newline at end of file
+    # Mode capture : gdb -q -ex 'set $capture = 1' -x solve_dynamic.py [hidden.bin]
+    if gdb.convenience_variable("capture"):
+        run_capture()
+    else:
+        run_solver()
\ No newline at end of file
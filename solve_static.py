@@ -33,13 +33,38 @@ def ror8(val: int, rot: int) -> int:
     rot &= 7
     return ((val >> rot) | ((val << (8 - rot)) & 0xFF)) & 0xFF
 
+def rol8(val: int, rot: int) -> int:
+    """Rotation binaire à gauche sur 8 bits (inverse de ror8)."""
+    return ror8(val, (8 - (rot & 7)) & 7)
+
+# ================= TRANSFORMATION PAR OCTET =================
+# Modèle de FUN_004029f9, partagé avec replay_oracle.py (sens direct).
+# Clés de la position i :
+#   Key1 = (seed >> (i & 7)) & 0xff   (dérivée de la seed)
+#   Key2 = (i + 0xA5) & 0xff          (constante additive de boucle)
+
+def encrypt_byte(byte_val: int, index: int, seed: int) -> int:
+    """Transformation directe (celle du binaire) : Cipher = ROL(Plain ^ Key1, i%5) ^ Key2."""
+    key1 = (seed >> (index & 7)) & 0xFF
+    key2 = (index + CONST_ADD_KEY) & 0xFF
+    return rol8((byte_val & 0xFF) ^ key1, index % 5) ^ key2
+
+def decrypt_byte(byte_val: int, index: int, seed: int) -> int:
+    """Transformation inverse : Plain = ROR(Cipher ^ Key2, i%5) ^ Key1."""
+    key1 = (seed >> (index & 7)) & 0xFF
+    key2 = (index + CONST_ADD_KEY) & 0xFF
+    rot = index % 5
+    tmp = (byte_val ^ key2) & 0xFF                       # Annulation du XOR additif
+    tmp = ((tmp >> rot) | (tmp << (8 - rot))) & 0xFF     # Annulation de la rotation (ror8, en ligne : boucle chaude)
+    return tmp ^ key1                                    # Annulation du XOR initial
+
 # ================= LOGIQUE DE DÉCHIFFREMENT =================
 
 def decrypt_candidate(encrypted_data: bytes, seed: int) -> bytearray:
     """
     Tente de déchiffrer le blob binaire avec une graine (seed) donnée.
     
-    L'algorithme inverse les opérations identifiées :
+    L'algorithme inverse les opérations identifiées (cf. decrypt_byte) :
     1. Cipher = ROL(Plain ^ Key1, i%5) ^ Key2
     2. Plain  = ROR(Cipher ^ Key2, i%5) ^ Key1
     
@@ -53,20 +78,7 @@ def decrypt_candidate(encrypted_data: bytes, seed: int) -> bytearray:
     out = bytearray()
     
     for i, byte_val in enumerate(encrypted_data):
-        # 1. Dérivation de la Clé 1 (basée sur la seed et la position)
-        # Formule : (seed >> (i & 7)) & 0xff
-        key1 = (seed >> (i & 7)) & 0xFF
-
-        # 2. Dérivation de la Clé 2 (Additive, constante de boucle)
-        # Formule : (i + 0xA5) & 0xff
-        key2 = (i + CONST_ADD_KEY) & 0xFF
-
-        # 3. Opérations inverses
-        tmp = byte_val ^ key2    # Annulation du XOR additif
-        tmp = ror8(tmp, i % 5)   # Annulation de la rotation (ROR inverse de ROL)
-        plain = tmp ^ key1       # Annulation du XOR initial
-        
-        out.append(plain & 0xFF)
+        out.append(decrypt_byte(byte_val, i, seed))
         
     return out
 
@@ -81,6 +93,29 @@ def is_valid_flag(buffer: bytearray) -> bool:
         pass # Contient des bytes non-ASCII, probablement pas le bon flag
     return False
 
+def find_flag(encrypted_data: bytes, progress: bool = True):
+    """
+    Parcourt l'espace des seeds jusqu'à trouver un déchiffrement valide.
+    
+    Args:
+        encrypted_data (bytes): Le contenu du fichier dumpé.
+        progress (bool): Affiche la barre de progression tqdm.
+        
+    Returns:
+        tuple: (seed, flag) ou None si aucune seed ne convient.
+    """
+    with tqdm(total=SEED_SPACE, bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} seeds",
+              dynamic_ncols=True, disable=not progress) as pbar:
+        for seed in range(SEED_SPACE):
+            candidate = decrypt_candidate(encrypted_data, seed)
+            
+            if is_valid_flag(candidate):
+                pbar.update(SEED_SPACE - seed) # Finir la barre proprement
+                return seed, candidate.decode("ascii")
+            
+            pbar.update(1)
+    return None
+
 # ================= MAIN EXECUTION =================
 
 def run_static_solver(filepath: str):
@@ -101,21 +136,7 @@ def run_static_solver(filepath: str):
 
     logging.info(f"Démarrage de l'attaque par force brute sur l'espace de clé (2^{15})...")
     
-    found_flag = None
-    found_seed = None
-
-    # Barre de progression
-    with tqdm(total=SEED_SPACE, bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} seeds", dynamic_ncols=True) as pbar:
-        for seed in range(SEED_SPACE):
-            candidate = decrypt_candidate(encrypted_data, seed)
-            
-            if is_valid_flag(candidate):
-                found_flag = candidate.decode("ascii")
-                found_seed = seed
-                pbar.update(SEED_SPACE - seed) # Finir la barre proprement
-                break
-            
-            pbar.update(1)
+    found_seed, found_flag = find_flag(encrypted_data) or (None, None)
 
     # Résultat
     if found_flag: